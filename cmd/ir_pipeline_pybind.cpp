@@ -0,0 +1,123 @@
+// Optional in-process binding for the IR pipeline.
+//
+// Built only when pybind11 is available (see CMakeLists.txt). The python
+// driver imports this to skip the fork+exec of the ir_pipeline binary per
+// case; it falls back to the subprocess path when the module is absent.
+#include <pybind11/pybind11.h>
+
+#include <filesystem>
+#include <fstream>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "src/ast/ast.hpp"
+#include "src/lexer/lexer.hpp"
+#include "src/mir/codegen/emitter.hpp"
+#include "src/mir/lower/lower.hpp"
+#include "src/parser/parser.hpp"
+#include "src/semantic/hir/converter.hpp"
+#include "src/semantic/pass/control_flow_linking/control_flow_linking.hpp"
+#include "src/semantic/pass/exit_check/exit_check.hpp"
+#include "src/semantic/pass/name_resolution/name_resolution.hpp"
+#include "src/semantic/pass/struct_enum_registration.hpp"
+#include "src/semantic/pass/semantic_check/semantic_check.hpp"
+#include "src/semantic/pass/trait_check/trait_check.hpp"
+#include "src/semantic/query/semantic_context.hpp"
+#include "src/semantic/symbol/predefined.hpp"
+#include "src/span/source_manager.hpp"
+#include "src/type/impl_table.hpp"
+#include "src/utils/error.hpp"
+
+namespace {
+
+// Same stages as cmd/ir_pipeline.cpp main(), but diagnostics are returned to
+// the caller instead of pretty-printed to stderr.
+std::pair<int, std::string> compile_file(const std::string &input, const std::string &output) {
+    const std::filesystem::path input_path = input;
+    const std::filesystem::path output_path = output;
+
+    span::SourceManager sources;
+
+    try {
+        std::ifstream file_stream(input_path);
+        if (!file_stream) {
+            return {1, "Error: could not open file " + input};
+        }
+
+        std::stringstream code_stream;
+        code_stream << file_stream.rdbuf();
+        std::string code = code_stream.str();
+
+        auto file_id = sources.add_file(input_path.string(), code);
+
+        Lexer lexer(code_stream, file_id);
+        const auto &tokens = lexer.tokenize();
+
+        const auto &registry = getParserRegistry();
+        auto file_parser = registry.item.many() < equal(T_EOF);
+        auto result = parsec::run(file_parser, tokens);
+
+        if (!std::holds_alternative<std::vector<ast::ItemPtr>>(result)) {
+            return {1, "Error: parsing failed"};
+        }
+
+        const auto &items = std::get<std::vector<ast::ItemPtr>>(result);
+
+        AstToHirConverter converter;
+        auto hir_program = converter.convert_program(items);
+        if (!hir_program) {
+            return {1, "Error: HIR conversion failed"};
+        }
+
+        semantic::ImplTable impl_table;
+        semantic::inject_predefined_methods(impl_table);
+        semantic::NameResolver name_resolver(impl_table);
+        name_resolver.visit_program(*hir_program);
+
+        semantic::SemanticContext semantic_ctx(impl_table);
+
+        semantic::StructEnumRegistrationPass registration_pass(semantic_ctx);
+        registration_pass.register_program(*hir_program);
+
+        semantic::TraitValidator trait_validator(semantic_ctx);
+        trait_validator.validate(*hir_program);
+
+        ControlFlowLinker control_flow_linker;
+        control_flow_linker.link_control_flow(*hir_program);
+
+        semantic::SemanticCheckVisitor semantic_checker(semantic_ctx);
+        semantic_checker.check_program(*hir_program);
+
+        semantic::ExitCheckVisitor exit_checker;
+        exit_checker.check_program(*hir_program);
+
+        mir::MirModule mir_module = mir::lower_program(*hir_program);
+
+        codegen::Emitter emitter(mir_module);
+        std::string ir = emitter.emit();
+
+        std::ofstream out(output_path);
+        if (!out) {
+            return {1, "Error: could not open output file " + output};
+        }
+        out << ir;
+        if (!ir.empty() && ir.back() != '\n') {
+            out << '\n';
+        }
+
+        return {0, "Success: wrote LLVM IR to " + output};
+
+    } catch (const std::exception &e) {
+        return {1, std::string("Error: ") + e.what()};
+    }
+}
+
+} // namespace
+
+PYBIND11_MODULE(ir_pipeline_ext, m) {
+    m.doc() = "In-process wrapper around the IR pipeline";
+    m.def("compile", &compile_file, pybind11::arg("input"), pybind11::arg("output"),
+          "Compile a .rx file to LLVM IR; returns (exit_code, message).");
+}
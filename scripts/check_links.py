@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Check that relative markdown links in the docs tree resolve to real files."""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RED = "\033[31m"
+GREEN = "\033[32m"
+RESET = "\033[0m"
+
+# Compiled once at import; these run over every markdown file in the tree.
+# Link syntax is pure ASCII, so the scan works on raw bytes and only the
+# matched text/url groups ever get decoded.
+_LINK_RE = re.compile(rb"\[([^\]]*)\]\(([^)]+)\)")
+_FENCE_RE = re.compile(rb"```")
+_LINE_SUFFIX_RE = re.compile(r":\d+$")
+
+EXTERNAL_PREFIXES = ("http://", "https://", "mailto:", "#")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check that relative markdown links under a docs tree point at existing files.",
+    )
+    parser.add_argument(
+        "--docs-root",
+        default="docs",
+        help="Directory to scan for markdown files, relative to the repository root.",
+    )
+    return parser.parse_args()
+
+
+def find_markdown_links(path: Path) -> list[tuple[int, str, str]]:
+    """Return (line_number, text, url) for every inline link outside code fences."""
+    links: list[tuple[int, str, str]] = []
+    with path.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return links  # empty file
+        with mm:
+            line_base = 1
+            for index, part in enumerate(_FENCE_RE.split(mm)):
+                # Even-numbered parts sit outside ``` fences; scan the whole
+                # slice in one pass instead of re-running the pattern per line.
+                if index % 2 == 0:
+                    for match in _LINK_RE.finditer(part):
+                        line_num = line_base + part.count(b"\n", 0, match.start())
+                        links.append((
+                            line_num,
+                            match.group(1).decode("utf-8", errors="replace"),
+                            match.group(2).decode("utf-8", errors="replace"),
+                        ))
+                line_base += part.count(b"\n")
+    return links
+
+
+def resolve_path(base_dir: Path, url: str) -> Path:
+    target = url.split("#", 1)[0]
+    # Overview docs link with a `path:line` suffix; only the path part matters.
+    target = _LINE_SUFFIX_RE.sub("", target)
+    return (base_dir / target).resolve()
+
+
+def build_existing_paths(docs_dir: Path) -> set[str]:
+    """Collect every path under docs_dir in one walk instead of stat-ing per link."""
+    existing = {str(docs_dir)}
+    for root, dirs, files in os.walk(docs_dir, followlinks=False):
+        for name in dirs:
+            existing.add(os.path.join(root, name))
+        for name in files:
+            existing.add(os.path.join(root, name))
+    return existing
+
+
+@functools.lru_cache(maxsize=None)
+def _exists_outside_docs(path: str) -> bool:
+    return Path(path).exists()
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_str(base_dir_str: str, url: str) -> str:
+    """Memoized resolve_path; the same target is linked from many files."""
+    return str(resolve_path(Path(base_dir_str), url))
+
+
+def check_links(docs_dir: Path) -> list[tuple[Path, int, str, str]]:
+    md_files = sorted(docs_dir.rglob("*.md"))
+    existing = build_existing_paths(docs_dir)
+    docs_prefix = str(docs_dir) + os.sep
+    broken: list[tuple[Path, int, str, str]] = []
+    # Per-file scanning is independent and I/O-bound, so fan it out over
+    # threads; resolution against the path set stays in the main thread.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        file_links = zip(md_files, executor.map(find_markdown_links, md_files))
+        links_by_file = list(file_links)
+    for md_file, links in links_by_file:
+        for line_num, text, url in links:
+            if url.startswith(EXTERNAL_PREFIXES):
+                continue
+            resolved = _resolve_str(str(md_file.parent), url)
+            if resolved in existing:
+                continue
+            # Links escaping the docs tree (../src/...) fall back to a
+            # memoized stat so repeated targets are checked only once.
+            if not resolved.startswith(docs_prefix) and _exists_outside_docs(resolved):
+                continue
+            broken.append((md_file, line_num, text, url))
+    return broken
+
+
+def main() -> int:
+    args = parse_args()
+    repo_root = Path(__file__).resolve().parent.parent
+    docs_dir = (repo_root / args.docs_root).resolve()
+    if not docs_dir.is_dir():
+        sys.stderr.write(f"error: docs directory not found: {docs_dir}\n")
+        return 1
+
+    broken = check_links(docs_dir)
+    if broken:
+        lines = [
+            f"{RED}{md_file.relative_to(repo_root)}:{line_num}: broken link [{text}]({url}){RESET}"
+            for md_file, line_num, text, url in broken
+        ]
+        lines.append(f"{RED}Broken links: {len(broken)}{RESET}")
+        print("\n".join(lines))
+        return 1
+
+    print(f"{GREEN}All relative links resolve.{RESET}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
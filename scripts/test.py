@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 
@@ -48,11 +51,18 @@ def discover_cases(src_dir: Path) -> list[Path]:
 	return sorted(src_dir.rglob("*.rx"))
 
 
+# The verdict lives in the leading comment block; never scan past this.
+VERDICT_SCAN_LIMIT = 64
+
+
 def parse_verdict(case_path: Path) -> str:
-	for line in case_path.read_text(encoding="utf-8").splitlines():
-		stripped = line.strip()
-		if stripped.lower().startswith("verdict:"):
-			return stripped.split(":", 1)[1].strip()
+	with case_path.open(encoding="utf-8") as f:
+		for line_num, line in enumerate(f):
+			if line_num >= VERDICT_SCAN_LIMIT:
+				break
+			stripped = line.strip()
+			if stripped.lower().startswith("verdict:"):
+				return stripped.split(":", 1)[1].strip()
 	raise ValueError(f"verdict not found in {case_path}")
 
 
@@ -68,12 +78,34 @@ def extract_last_line(text: str) -> str:
 	return lines[-1] if lines else "<no output>"
 
 
-def run_case(binary_path: Path, case_path: Path) -> subprocess.CompletedProcess[str]:
-	return subprocess.run(
-		[str(binary_path), str(case_path)],
-		capture_output=True,
-		text=True,
-	)
+def read_last_line(path: Path, tail_bytes: int = 4096) -> str:
+	with path.open("rb") as f:
+		f.seek(0, os.SEEK_END)
+		f.seek(max(0, f.tell() - tail_bytes))
+		return extract_last_line(f.read().decode("utf-8", errors="replace"))
+
+
+def run_one(binary_path: Path, item: tuple[Path, Path, Path]) -> tuple[str, bool, bool, int]:
+	"""Run a single case and capture its output; safe to call from worker threads."""
+	case_path, _rel_case, out_path = item
+
+	verdict_text = parse_verdict(case_path)
+	expected_success = verdict_to_success(verdict_text)
+
+	# Let the pipeline write straight into the .out file instead of buffering
+	# both streams in memory and re-encoding them here. Write to a .tmp and
+	# rename so anything watching the output tree never sees a partial file.
+	tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+	with tmp_path.open("wb") as out_file:
+		result = subprocess.run(
+			[str(binary_path), str(case_path)],
+			stdout=out_file,
+			stderr=subprocess.STDOUT,
+		)
+	os.replace(tmp_path, out_path)
+
+	actual_success = result.returncode == 0
+	return (verdict_text, expected_success, actual_success, result.returncode)
 
 
 def main() -> int:
@@ -101,36 +133,35 @@ def main() -> int:
 	total_cases = len(cases)
 	print(f"Running {total_cases} cases from {src_dir} using {binary_path}")
 
-	mismatches: list[tuple[Path, Path, str, bool, bool, int, str]] = []
-	for index, case_path in enumerate(cases, start=1):
+	# Resolve every per-case path once up front; the hot loop just unpacks.
+	work_items: list[tuple[Path, Path, Path]] = []
+	for case_path in cases:
 		rel_case = case_path.relative_to(src_dir)
-		out_path = output_root / rel_case.with_suffix(".out")
-		out_path.parent.mkdir(parents=True, exist_ok=True)
-
-		try:
-			verdict_text = parse_verdict(case_path)
-			expected_success = verdict_to_success(verdict_text)
-		except ValueError as exc:
-			sys.stderr.write(f"error: {exc}\n")
-			return 1
-
-		result = run_case(binary_path, case_path)
-		output_text = result.stdout
-		if result.stderr:
-			output_text += ("\n" if output_text else "") + result.stderr
-		out_path.write_text(output_text, encoding="utf-8")
-
-		actual_success = result.returncode == 0
-		mismatch = actual_success != expected_success
-		if mismatch:
-			status = f"{RED}verdict mismatch (expected {verdict_text}, exit {result.returncode}){RESET}"
-		else:
-			status = "ok" if expected_success else f"expected fail (exit {result.returncode})"
-		print(f"[{index}/{len(cases)}] {rel_case} -> {out_path} : {status}")
-
-		if mismatch:
-			last_line = extract_last_line(output_text)
-			mismatches.append((case_path, rel_case, verdict_text, expected_success, actual_success, result.returncode, last_line))
+		work_items.append((case_path, rel_case, output_root / rel_case.with_suffix(".out")))
+	for parent in {out_path.parent for _, _, out_path in work_items}:
+		parent.mkdir(parents=True, exist_ok=True)
+
+	mismatches: list[tuple[Path, Path, str, bool, bool, int, str]] = []
+	run = partial(run_one, binary_path)
+	try:
+		with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+			results = zip(work_items, executor.map(run, work_items))
+			for index, (item, record) in enumerate(results, start=1):
+				case_path, rel_case, out_path = item
+				verdict_text, expected_success, actual_success, returncode = record
+				mismatch = actual_success != expected_success
+				if mismatch:
+					status = f"{RED}verdict mismatch (expected {verdict_text}, exit {returncode}){RESET}"
+				else:
+					status = "ok" if expected_success else f"expected fail (exit {returncode})"
+				print(f"[{index}/{len(cases)}] {rel_case} -> {out_path} : {status}")
+
+				if mismatch:
+					last_line = read_last_line(out_path)
+					mismatches.append((case_path, rel_case, verdict_text, expected_success, actual_success, returncode, last_line))
+	except ValueError as exc:
+		sys.stderr.write(f"error: {exc}\n")
+		return 1
 
 	summary_path = output_root / "summary"
 	summary_lines: list[str] = []
@@ -4,11 +4,18 @@
 from __future__ import annotations
 
 import argparse
+import filecmp
+import hashlib
+import io
+import os
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
 
 CLANG_CANDIDATES = ["clang-18", "clang-17", "clang-16", "clang-15", "clang"]
@@ -71,6 +78,11 @@ def parse_args() -> argparse.Namespace:
         "--output-root",
         help="Directory to store outputs and logs; default is scripts/output/<test_set>-ir",
     )
+    parser.add_argument(
+        "--tmp-dir",
+        help="Directory to create the temporary working tree in; default is /dev/shm when "
+        "writable (keeps intermediates in RAM), else the system default.",
+    )
     parser.add_argument(
         "--keep-temps",
         action="store_true",
@@ -115,9 +127,31 @@ def parse_args() -> argparse.Namespace:
         default=1024,
         help="Stack size (in kB) for reimu execution. Default: 1024 kB.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of cases to run concurrently. Default: CPU count.",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Compile via the ir_pipeline_ext extension (built with -DBUILD_IR_PIPELINE_EXT=ON) "
+        "instead of spawning the binary per case. --timeout-ir is not enforced in this mode.",
+    )
     return parser.parse_args()
 
 
+def _tmp_base() -> str | None:
+    # All intermediates (test.ll, test.s, test.out, ...) are throwaway and
+    # read once, so prefer tmpfs over whatever disk $TMPDIR points at.
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return str(shm)
+    return None
+
+
+@lru_cache(maxsize=None)
 def detect_clang(user_choice: str | None) -> str:
     if user_choice:
         if shutil.which(user_choice):
@@ -133,16 +167,18 @@ def detect_clang(user_choice: str | None) -> str:
     sys.exit(1)
 
 
-def run_cmd(cmd: list[str], cwd: Path | None = None, timeout: int | None = None) -> subprocess.CompletedProcess[str]:
+def run_cmd(cmd: list[str], cwd: Path | None = None, timeout: int | None = None) -> subprocess.CompletedProcess[bytes]:
+    # Capture raw bytes; most output goes straight into a log file, so decode
+    # only at the few places that actually print or inspect it.
     try:
-        return subprocess.run(cmd, capture_output=True, text=True, cwd=cwd, timeout=timeout)
+        return subprocess.run(cmd, capture_output=True, cwd=cwd, timeout=timeout)
     except subprocess.TimeoutExpired as e:
         # Create a CompletedProcess-like object with timeout info
         result = subprocess.CompletedProcess(cmd, returncode=-1)
-        result.stdout = e.stdout.decode("utf-8") if e.stdout else ""
-        result.stderr = e.stderr.decode("utf-8") if e.stderr else ""
+        result.stdout = e.stdout or b""
+        result.stderr = e.stderr or b""
         if not result.stderr:
-            result.stderr = f"Process timed out after {timeout} seconds"
+            result.stderr = f"Process timed out after {timeout} seconds".encode()
         return result
 
 
@@ -158,17 +194,33 @@ def ensure_dir(path: Path, description: str) -> None:
         sys.exit(1)
 
 
-def remove_plt(source: Path, dest: Path) -> None:
-    dest.write_text(source.read_text(encoding="utf-8").replace("@plt", ""), encoding="utf-8")
+def fast_clone(src: Path, dst: Path) -> None:
+    """Hardlink a read-only input into a work dir; fall back to a real copy."""
+    try:
+        if dst.exists():
+            dst.unlink()
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
+def normalize_output(path: Path) -> list[bytes]:
+    # Mirror `diff -ZB`: drop trailing whitespace and blank lines before
+    # comparing. Works on raw bytes so nothing is UTF-8 decoded.
+    data = path.read_bytes()
+    return [line.rstrip() for line in data.split(b"\n") if line.strip()]
 
 
-def normalize_output(path: Path) -> list[str]:
-    # Mirror `diff -ZB`: drop trailing whitespace and blank lines before comparing.
-    lines = path.read_text(encoding="utf-8").splitlines()
-    return [line.rstrip() for line in lines if line.rstrip()]
+def outputs_equal(actual: Path, expected: Path) -> bool:
+    # Most passing cases are byte-identical; filecmp compares in fixed-size
+    # buffers without loading either file whole. Only fall back to the
+    # normalizing compare when they differ.
+    if filecmp.cmp(actual, expected, shallow=False):
+        return True
+    return normalize_output(actual) == normalize_output(expected)
 
 
-def run_native_executable(executable: Path, stdin_path: Path, stdout_path: Path, timeout: int | None = None) -> subprocess.CompletedProcess[str]:
+def run_native_executable(executable: Path, stdin_path: Path, stdout_path: Path, timeout: int | None = None) -> subprocess.CompletedProcess[bytes]:
     try:
         with stdin_path.open("rb") as stdin_file, stdout_path.open("wb") as stdout_file:
             result = subprocess.run(
@@ -176,36 +228,72 @@ def run_native_executable(executable: Path, stdin_path: Path, stdout_path: Path,
                 stdin=stdin_file,
                 stdout=stdout_file,
                 stderr=subprocess.PIPE,
-                text=False,
                 timeout=timeout,
             )
     except subprocess.TimeoutExpired as e:
         result = subprocess.CompletedProcess([str(executable)], returncode=-1)
-        result.stdout = ""
-        stderr_bytes = e.stderr if e.stderr else b""
-        result.stderr = stderr_bytes.decode("utf-8", errors="replace") if stderr_bytes else f"Process timed out after {timeout} seconds"
+        result.stdout = b""
+        result.stderr = e.stderr or f"Process timed out after {timeout} seconds".encode()
         return result
 
-    result.stdout = ""
-    stderr_bytes = result.stderr if result.stderr else b""
-    result.stderr = stderr_bytes.decode("utf-8", errors="replace")
+    result.stdout = b""
+    result.stderr = result.stderr or b""
     return result
 
 
+@lru_cache(maxsize=None)
+def _clang_version(clang: str) -> bytes:
+    try:
+        return subprocess.check_output([clang, "--version"])
+    except (OSError, subprocess.CalledProcessError):
+        return clang.encode()
+
+
+def asm_cache_path(kind: str, clang: str, target: str, content: bytes) -> Path:
+    """Cache location for compiled assembly, keyed on everything that affects it."""
+    key = hashlib.sha256(content + target.encode() + _clang_version(clang)).hexdigest()
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "rcompiler" / kind / f"{key}.s"
+
+
+def store_in_cache(source: Path, cache_path: Path) -> None:
+    """Best-effort atomic publish into the cache; never fails the run."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name per writer: with a fixed one, two concurrent
+        # publishers of the same key would share an inode and a reader could
+        # see a half-written entry after the first rename.
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source, tmp_name)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        pass
+
+
 def compile_builtin(clang: str, target: str, builtin_path: Path, work_root: Path, timeout: int | None = None) -> Path:
-    builtin_source = work_root / "builtin.s.source"
     builtin_clean = work_root / "builtin.s"
 
+    # builtin.c almost never changes; reuse the cached assembly when the
+    # source/target/clang combination has been compiled before.
+    cache_path = asm_cache_path("builtin", clang, target, builtin_path.read_bytes())
+    if cache_path.is_file():
+        shutil.copyfile(cache_path, builtin_clean)
+        return builtin_clean
+
+    # Ask clang for the assembly on stdout and strip @plt in memory rather
+    # than round-tripping a .s.source file through disk.
     result = run_cmd(
-        [clang, "-S", f"--target={target}", "-O2", "-fno-builtin", str(builtin_path), "-o", str(builtin_source)],
+        [clang, "-S", f"--target={target}", "-O2", "-fno-builtin", str(builtin_path), "-o", "-"],
         timeout=timeout,
     )
     if result.returncode != 0:
         sys.stderr.write("error: failed to compile builtin.c\n")
-        sys.stderr.write(result.stderr)
+        sys.stderr.write(result.stderr.decode("utf-8", errors="replace"))
         sys.exit(1)
 
-    remove_plt(builtin_source, builtin_clean)
+    builtin_clean.write_bytes(result.stdout.replace(b"@plt", b""))
+    store_in_cache(builtin_clean, cache_path)
     return builtin_clean
 
 
@@ -217,7 +305,7 @@ def compile_builtin_native(clang: str, builtin_path: Path, work_root: Path, time
     )
     if result.returncode != 0:
         sys.stderr.write("error: failed to compile builtin.c for host execution\n")
-        sys.stderr.write(result.stderr)
+        sys.stderr.write(result.stderr.decode("utf-8", errors="replace"))
         sys.exit(1)
     return builtin_obj
 
@@ -229,14 +317,25 @@ def compile_host_wrapper(clang: str, work_root: Path, timeout: int | None = None
     result = run_cmd([clang, "-c", str(wrapper_src), "-o", str(wrapper_obj)], timeout=timeout)
     if result.returncode != 0:
         sys.stderr.write("error: failed to compile host wrapper\n")
-        sys.stderr.write(result.stderr)
+        sys.stderr.write(result.stderr.decode("utf-8", errors="replace"))
         sys.exit(1)
     return wrapper_obj
 
 
-def extract_last_line(text: str) -> str:
-    stripped = text.rstrip().splitlines()
-    return stripped[-1] if stripped else "<no output>"
+def log_stage(logf: io.BufferedWriter, header: bytes, out: bytes = b"", err: bytes = b"") -> None:
+    """Append one stage's header and streams to an open per-case log."""
+    logf.write(header + b"\n")
+    if out:
+        logf.write(out.rstrip() + b"\n")
+    if err:
+        logf.write(err.rstrip() + b"\n")
+
+
+def extract_last_line(data: bytes) -> str:
+    stripped = data.rstrip()
+    if not stripped:
+        return "<no output>"
+    return stripped.rsplit(b"\n", 1)[-1].decode("utf-8", errors="replace")
 
 
 def preserve_intermediates(output_dir: Path, case_name_stem: str, work_dir: Path) -> None:
@@ -256,6 +355,195 @@ def preserve_intermediates(output_dir: Path, case_name_stem: str, work_dir: Path
         shutil.copy(asm_clean_file, output_dir / f"{case_name_stem}.s")
 
 
+def iter_rx(root: Path, base: Path, pattern: re.Pattern[str] | None):
+    """Yield .rx files under root, filtering against base-relative paths during the walk."""
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_rx(Path(entry.path), base, pattern)
+        elif entry.name.endswith(".rx"):
+            path = Path(entry.path)
+            if pattern is None or pattern.search(str(path.relative_to(base))):
+                yield path
+
+
+def load_ir_pipeline_ext(binary_dir: Path):
+    """Import the optional in-process extension built next to ir_pipeline."""
+    sys.path.insert(0, str(binary_dir))
+    try:
+        import ir_pipeline_ext
+    except ImportError:
+        return None
+    finally:
+        sys.path.remove(str(binary_dir))
+    return ir_pipeline_ext
+
+
+def run_one_case(
+    binary_path: Path,
+    ext,
+    src_dir: Path,
+    temp_root: Path,
+    output_root: Path,
+    compiled_builtin: Path,
+    host_wrapper: Path | None,
+    clang: str,
+    args: argparse.Namespace,
+    memo: dict[str, tuple[bytes, bytes]] | None,
+    memo_lock: threading.Lock,
+    case_path: Path,
+) -> tuple[Path, str, str | None]:
+    """Run one case end to end; returns (rel_case, status label, failure reason or None).
+
+    The caller has already verified that the .in/.out companions exist.
+    """
+    rel_case = case_path.relative_to(src_dir)
+    case_dir = case_path.parent
+    case_name = case_path.stem
+    case_in = case_dir / f"{case_name}.in"
+    case_out = case_dir / f"{case_name}.out"
+
+    # Every case gets its own directory so concurrent workers never share the
+    # fixed test.* file names. Parents exist already (pre-created in main).
+    work_dir = temp_root / rel_case.with_suffix("")
+    work_dir.mkdir(exist_ok=True)
+
+    def finish(status: str, reason: str | None) -> tuple[Path, str, str | None]:
+        if args.preserve_intermediates:
+            preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
+        return (rel_case, status, reason)
+
+    # Prepare inputs. None of these are mutated, so a hardlink (an inode
+    # bump) beats copying the bytes once per case.
+    if not args.run_locally:
+        fast_clone(compiled_builtin, work_dir / "builtin.s")
+    fast_clone(case_in, work_dir / "test.in")
+    fast_clone(case_out, work_dir / "test.ans")
+
+    ir_path = work_dir / "test.ll"
+    actual_output = work_dir / "test.out"
+
+    # Test sets repeat sources across subdirectories; when this exact .rx has
+    # already been compiled this run, reuse its artifacts and only rerun reimu
+    # (the .in may differ).
+    cached: tuple[bytes, bytes] | None = None
+    case_key = None
+    if memo is not None:
+        case_key = hashlib.sha256(case_path.read_bytes()).hexdigest()
+        with memo_lock:
+            cached = memo.get(case_key)
+
+    # Stream each stage's output into the log as it lands instead of
+    # accumulating a second copy of everything in a list.
+    with (output_root / rel_case.with_suffix(".log")).open("wb") as logf:
+        # 1) ir_pipeline
+        if cached is not None:
+            ir_path.write_bytes(cached[0])
+            result_ir = subprocess.CompletedProcess([str(binary_path)], 0)
+            result_ir.stdout = b"(memoized)"
+            result_ir.stderr = b""
+        elif ext is not None:
+            # In-process call: no fork+exec, diagnostics come back as a string.
+            returncode, message = ext.compile(str(case_path), str(ir_path))
+            result_ir = subprocess.CompletedProcess([str(binary_path)], returncode)
+            result_ir.stdout = message.encode() if returncode == 0 else b""
+            result_ir.stderr = b"" if returncode == 0 else message.encode()
+        else:
+            result_ir = run_cmd([str(binary_path), str(case_path), str(ir_path)], timeout=args.timeout_ir)
+        log_stage(logf, b"== ir_pipeline ==", result_ir.stdout, result_ir.stderr)
+
+        if result_ir.returncode != 0:
+            reason = f"ir_pipeline exit {result_ir.returncode}: {extract_last_line(result_ir.stderr or result_ir.stdout)}"
+            if result_ir.returncode == -1:
+                reason = f"ir_pipeline timeout (>{args.timeout_ir}s): {extract_last_line(result_ir.stderr or result_ir.stdout)}"
+            return finish("fail (compile)", reason)
+
+        if args.run_locally:
+            exe_path = work_dir / "test.bin"
+            assert host_wrapper is not None
+            result_clang = run_cmd([
+                clang,
+                "-O2",
+                str(ir_path),
+                str(compiled_builtin),
+                str(host_wrapper),
+                "-Wl,--wrap=main",
+                "-o",
+                str(exe_path),
+            ], timeout=args.timeout_clang)
+            log_stage(logf, b"== clang (host) ==", result_clang.stdout, result_clang.stderr)
+
+            if result_clang.returncode != 0:
+                reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr or result_clang.stdout)}"
+                if result_clang.returncode == -1:
+                    reason = f"clang timeout (>{args.timeout_clang}s): {extract_last_line(result_clang.stderr or result_clang.stdout)}"
+                return finish("fail (clang)", reason)
+
+            result_run = run_native_executable(exe_path, work_dir / "test.in", actual_output, timeout=args.timeout_reimu)
+            log_stage(logf, b"== host run ==", err=result_run.stderr)
+
+            if result_run.returncode != 0:
+                reason = f"program exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
+                if result_run.returncode == -1:
+                    reason = f"program timeout (>{args.timeout_reimu}s): {extract_last_line(result_run.stderr or result_run.stdout)}"
+                return finish("fail (runtime)", reason)
+        else:
+            asm_clean = work_dir / "test.s"
+            # Identical .ll inputs assemble to identical .s; skip clang entirely
+            # on a content-cache hit. Bypassed under --preserve-intermediates so
+            # test.s.source is always real clang output.
+            asm_cache = None if args.preserve_intermediates else asm_cache_path("asm", clang, args.target, ir_path.read_bytes())
+            if cached is not None:
+                asm_clean.write_bytes(cached[1])
+                log_stage(logf, b"== clang ==", b"(memoized)")
+            elif asm_cache is not None and asm_cache.is_file():
+                fast_clone(asm_cache, asm_clean)
+                log_stage(logf, b"== clang ==", b"(cached)")
+            else:
+                # Assembly arrives on stdout; only stderr carries diagnostics now.
+                result_clang = run_cmd([clang, "-S", f"--target={args.target}", str(ir_path), "-o", "-"], timeout=args.timeout_clang)
+                log_stage(logf, b"== clang ==", err=result_clang.stderr)
+
+                if result_clang.returncode != 0:
+                    reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr)}"
+                    if result_clang.returncode == -1:
+                        reason = f"clang timeout (>{args.timeout_clang}s): {extract_last_line(result_clang.stderr)}"
+                    return finish("fail (clang)", reason)
+
+                if args.preserve_intermediates:
+                    (work_dir / "test.s.source").write_bytes(result_clang.stdout)
+                asm_clean.write_bytes(result_clang.stdout.replace(b"@plt", b""))
+                if asm_cache is not None:
+                    store_in_cache(asm_clean, asm_cache)
+
+            if memo is not None and cached is None:
+                artifacts = (ir_path.read_bytes(), asm_clean.read_bytes())
+                with memo_lock:
+                    memo.setdefault(case_key, artifacts)
+
+            result_run = run_cmd([
+                args.reimu,
+                f"-i={work_dir / 'test.in'}",
+                f"-o={actual_output}",
+                f"-s={args.stack_size}K",
+            ], cwd=work_dir, timeout=args.timeout_reimu)
+            log_stage(logf, b"== reimu ==", result_run.stdout, result_run.stderr)
+
+            if result_run.returncode != 0:
+                reason = f"reimu exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
+                if result_run.returncode == -1:
+                    reason = f"reimu timeout (>{args.timeout_reimu}s): {extract_last_line(result_run.stderr or result_run.stdout)}"
+                return finish("fail (runtime)", reason)
+
+    # 4) compare outputs
+    matched = outputs_equal(actual_output, work_dir / "test.ans")
+
+    shutil.copyfile(actual_output, output_root / rel_case.with_suffix(".out"))
+
+    if matched:
+        return finish("ok", None)
+    return finish("fail (output)", "output mismatch")
+
+
 def main() -> int:
     args = parse_args()
     repo_root = Path(__file__).resolve().parent.parent
@@ -282,14 +570,17 @@ def main() -> int:
     output_root = output_root.resolve()
     output_root.mkdir(parents=True, exist_ok=True)
 
-    cases = sorted(src_dir.rglob("*.rx"))
+    filter_re = None
     if args.filter:
         try:
             filter_re = re.compile(args.filter)
         except re.error as exc:
             sys.stderr.write(f"error: invalid regex for --filter: {exc}\n")
             return 1
-        cases = [case for case in cases if filter_re.search(str(case.relative_to(src_dir)))]
+
+    # Filter during the scandir walk so rejected cases never become Paths in
+    # a big intermediate list.
+    cases = sorted(iter_rx(src_dir, src_dir, filter_re))
 
     if not cases:
         if args.filter:
@@ -303,7 +594,7 @@ def main() -> int:
     else:
         print(f"Using clang='{clang}', reimu='{args.reimu}', target='{args.target}'")
 
-    temp_dir_obj = tempfile.TemporaryDirectory(prefix="rcompiler-ir-")
+    temp_dir_obj = tempfile.TemporaryDirectory(prefix="rcompiler-ir-", dir=args.tmp_dir or _tmp_base())
     temp_root = Path(temp_dir_obj.name)
     if args.keep_temps:
         print(f"Keeping temporary files at {temp_root}")
@@ -319,165 +610,73 @@ def main() -> int:
 
     failures: list[tuple[Path, str]] = []
     total = len(cases)
+    done = 0
 
-    for idx, case_path in enumerate(cases, start=1):
-        rel_case = case_path.relative_to(src_dir)
+    # Check for .in/.out companions once up front so workers never stat for
+    # them; cases missing one are recorded as failures without entering the pool.
+    runnable: list[Path] = []
+    for case_path in cases:
         case_dir = case_path.parent
-        case_name = case_path.stem
-        case_in = case_dir / f"{case_name}.in"
-        case_out = case_dir / f"{case_name}.out"
-
-        if not case_in.is_file() or not case_out.is_file():
-            failures.append((rel_case, "missing .in or .out file"))
-            print(f"[{idx}/{total}] {rel_case}: {RED}missing input/output{RESET}")
-            continue
-
-        work_dir = temp_root / rel_case.parent
-        work_dir.mkdir(parents=True, exist_ok=True)
-
-        # Prepare inputs.
-        if not args.run_locally:
-            shutil.copy(compiled_builtin, work_dir / "builtin.s")
-        shutil.copy(case_in, work_dir / "test.in")
-        shutil.copy(case_out, work_dir / "test.ans")
-
-        ir_path = work_dir / "test.ll"
-        actual_output = work_dir / "test.out"
-
-        log_lines: list[str] = []
-
-        # 1) ir_pipeline
-        result_ir = run_cmd([str(binary_path), str(case_path), str(ir_path)], timeout=args.timeout_ir)
-        log_lines.append("== ir_pipeline ==")
-        if result_ir.stdout:
-            log_lines.append(result_ir.stdout.rstrip())
-        if result_ir.stderr:
-            log_lines.append(result_ir.stderr.rstrip())
-
-        if result_ir.returncode != 0:
-            reason = f"ir_pipeline exit {result_ir.returncode}: {extract_last_line(result_ir.stderr or result_ir.stdout)}"
-            if result_ir.returncode == -1:
-                reason = f"ir_pipeline timeout (>{args.timeout_ir}s): {extract_last_line(result_ir.stderr or result_ir.stdout)}"
-            failures.append((rel_case, reason))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (compile){RESET}")
-            (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-            (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-            if args.preserve_intermediates:
-                preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
-            continue
-
-        if args.run_locally:
-            exe_path = work_dir / "test.bin"
-            assert host_wrapper is not None
-            result_clang = run_cmd([
-                clang,
-                "-O2",
-                str(ir_path),
-                str(compiled_builtin),
-                str(host_wrapper),
-                "-Wl,--wrap=main",
-                "-o",
-                str(exe_path),
-            ], timeout=args.timeout_clang)
-            log_lines.append("== clang (host) ==")
-            if result_clang.stdout:
-                log_lines.append(result_clang.stdout.rstrip())
-            if result_clang.stderr:
-                log_lines.append(result_clang.stderr.rstrip())
-
-            if result_clang.returncode != 0:
-                reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr or result_clang.stdout)}"
-                if result_clang.returncode == -1:
-                    reason = f"clang timeout (>{args.timeout_clang}s): {extract_last_line(result_clang.stderr or result_clang.stdout)}"
-                failures.append((rel_case, reason))
-                print(f"[{idx}/{total}] {rel_case}: {RED}fail (clang){RESET}")
-                (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-                (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-                if args.preserve_intermediates:
-                    preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
-                continue
-
-            result_run = run_native_executable(exe_path, work_dir / "test.in", actual_output, timeout=args.timeout_reimu)
-            log_lines.append("== host run ==")
-            if result_run.stderr:
-                log_lines.append(result_run.stderr.rstrip())
-
-            if result_run.returncode != 0:
-                reason = f"program exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
-                if result_run.returncode == -1:
-                    reason = f"program timeout (>{args.timeout_reimu}s): {extract_last_line(result_run.stderr or result_run.stdout)}"
-                failures.append((rel_case, reason))
-                print(f"[{idx}/{total}] {rel_case}: {RED}fail (runtime){RESET}")
-                (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-                (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-                if args.preserve_intermediates:
-                    preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
-                continue
+        if (case_dir / f"{case_path.stem}.in").is_file() and (case_dir / f"{case_path.stem}.out").is_file():
+            runnable.append(case_path)
         else:
-            asm_source = work_dir / "test.s.source"
-            asm_clean = work_dir / "test.s"
-            result_clang = run_cmd([clang, "-S", f"--target={args.target}", str(ir_path), "-o", str(asm_source)], timeout=args.timeout_clang)
-            log_lines.append("== clang ==")
-            if result_clang.stdout:
-                log_lines.append(result_clang.stdout.rstrip())
-            if result_clang.stderr:
-                log_lines.append(result_clang.stderr.rstrip())
-
-            if result_clang.returncode != 0:
-                reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr or result_clang.stdout)}"
-                if result_clang.returncode == -1:
-                    reason = f"clang timeout (>{args.timeout_clang}s): {extract_last_line(result_clang.stderr or result_clang.stdout)}"
-                failures.append((rel_case, reason))
-                print(f"[{idx}/{total}] {rel_case}: {RED}fail (clang){RESET}")
-                (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-                (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-                if args.preserve_intermediates:
-                    preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
-                continue
-
-            remove_plt(asm_source, asm_clean)
-
-            result_run = run_cmd([
-                args.reimu,
-                f"-i={work_dir / 'test.in'}",
-                f"-o={actual_output}",
-                f"-s={args.stack_size}K",
-            ], cwd=work_dir, timeout=args.timeout_reimu)
-            log_lines.append("== reimu ==")
-            if result_run.stdout:
-                log_lines.append(result_run.stdout.rstrip())
-            if result_run.stderr:
-                log_lines.append(result_run.stderr.rstrip())
+            rel_case = case_path.relative_to(src_dir)
+            failures.append((rel_case, "missing .in or .out file"))
+            done += 1
+            print(f"[{done}/{total}] {rel_case}: {RED}missing input/output{RESET}")
+
+    # Create every output/work parent directory in one pass; each in-worker
+    # mkdir(parents=True) would stat the whole chain again per case.
+    needed_dirs = {output_root / p.relative_to(src_dir).parent for p in runnable}
+    needed_dirs |= {temp_root / p.relative_to(src_dir).parent for p in runnable}
+    for directory in sorted(needed_dirs):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    ext = None
+    if args.in_process:
+        ext = load_ir_pipeline_ext(binary_path.parent)
+        if ext is None:
+            sys.stderr.write(
+                "warning: ir_pipeline_ext not built (configure with -DBUILD_IR_PIPELINE_EXT=ON); "
+                "falling back to subprocess mode\n"
+            )
 
-            if result_run.returncode != 0:
-                reason = f"reimu exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
-                if result_run.returncode == -1:
-                    reason = f"reimu timeout (>{args.timeout_reimu}s): {extract_last_line(result_run.stderr or result_run.stdout)}"
+    # In-run memo for duplicate .rx sources: sha256(content) -> (.ll, .s).
+    # Off under --preserve-intermediates (every case must ship real
+    # intermediates) and --run-locally (no riscv .s to share).
+    memo: dict[str, tuple[bytes, bytes]] | None = None
+    memo_lock = threading.Lock()
+    if not args.preserve_intermediates and not args.run_locally:
+        memo = {}
+
+    run_case = partial(
+        run_one_case,
+        binary_path,
+        ext,
+        src_dir,
+        temp_root,
+        output_root,
+        compiled_builtin,
+        host_wrapper,
+        clang,
+        args,
+        memo,
+        memo_lock,
+    )
+    jobs = max(1, args.jobs or 1)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_case, case_path) for case_path in runnable]
+        for future in as_completed(futures):
+            rel_case, status, reason = future.result()
+            done += 1
+            if reason is None:
+                print(f"[{done}/{total}] {rel_case}: {GREEN}{status}{RESET}")
+            else:
                 failures.append((rel_case, reason))
-                print(f"[{idx}/{total}] {rel_case}: {RED}fail (runtime){RESET}")
-                (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-                (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-                if args.preserve_intermediates:
-                    preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
-                continue
-
-        # 4) compare outputs
-        actual_lines = normalize_output(actual_output)
-        expected_lines = normalize_output(work_dir / "test.ans")
-        matched = actual_lines == expected_lines
-
-        (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-        (output_root / rel_case.with_suffix(".out")).write_text(actual_output.read_text(encoding="utf-8"), encoding="utf-8")
-        (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-        
-        if args.preserve_intermediates:
-            preserve_intermediates(output_root / rel_case.parent, rel_case.stem, work_dir)
+                print(f"[{done}/{total}] {rel_case}: {RED}{status}{RESET}")
 
-        if matched:
-            print(f"[{idx}/{total}] {rel_case}: {GREEN}ok{RESET}")
-        else:
-            failures.append((rel_case, "output mismatch"))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (output){RESET}")
+    # as_completed yields in finish order; keep the summary deterministic.
+    failures.sort(key=lambda item: str(item[0]))
 
     if not args.keep_temps:
         temp_dir_obj.cleanup()
@@ -9,9 +9,16 @@ RCompiler-Testcases.
 from __future__ import annotations
 
 import argparse
+import filecmp
+import hashlib
+import io
+import os
 import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
 
 CLANG_CANDIDATES = ["clang-18", "clang-17", "clang-16", "clang-15", "clang"]
@@ -54,13 +61,20 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--output-root",
-        help="Directory to store outputs and logs; default is <test-root>/output",
+        help="Directory to store outputs and logs; default is <test-root>/output. "
+        "Point it at tmpfs (e.g. /dev/shm/rcompiler-e2e) for ephemeral CI runs.",
     )
     parser.add_argument(
         "--keep-working-files",
         action="store_true",
         help="Keep intermediate working files (builtin.s, test.ll, test.s, etc.) in output directory.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of cases to run concurrently. Default: CPU count.",
+    )
     return parser.parse_args()
 
 
@@ -86,8 +100,10 @@ def detect_reimu(user_choice: str) -> str:
     sys.exit(1)
 
 
-def run_cmd(cmd: list[str], cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
-    return subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+def run_cmd(cmd: list[str], cwd: Path | None = None) -> subprocess.CompletedProcess[bytes]:
+    # Capture raw bytes; most output goes straight into a log file, so decode
+    # only at the few places that actually print or inspect it.
+    return subprocess.run(cmd, capture_output=True, cwd=cwd)
 
 
 def ensure_file(path: Path, description: str) -> None:
@@ -102,34 +118,173 @@ def ensure_dir(path: Path, description: str) -> None:
         sys.exit(1)
 
 
-def remove_plt(source: Path, dest: Path) -> None:
-    dest.write_text(source.read_text(encoding="utf-8").replace("@plt", ""), encoding="utf-8")
-
-
-def normalize_output(path: Path) -> list[str]:
-    lines = path.read_text(encoding="utf-8").splitlines()
-    return [line.rstrip() for line in lines if line.rstrip()]
+def fast_clone(src: Path, dst: Path) -> None:
+    """Hardlink a read-only input into a work dir; fall back to a real copy."""
+    try:
+        if dst.exists():
+            dst.unlink()
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
+def normalize_output(path: Path) -> list[bytes]:
+    # Byte-level so nothing is UTF-8 decoded just for a comparison.
+    data = path.read_bytes()
+    return [line.rstrip() for line in data.split(b"\n") if line.strip()]
+
+
+def outputs_equal(actual: Path, expected: Path) -> bool:
+    # Most passing cases are byte-identical; filecmp compares in fixed-size
+    # buffers without loading either file whole. Only fall back to the
+    # normalizing compare when they differ.
+    if filecmp.cmp(actual, expected, shallow=False):
+        return True
+    return normalize_output(actual) == normalize_output(expected)
+
+
+def builtin_cache_path(clang: str, target: str, builtin_bytes: bytes) -> Path:
+    """Cache location for a compiled builtin.s, keyed on everything that affects it."""
+    try:
+        clang_version = subprocess.check_output([clang, "--version"])
+    except (OSError, subprocess.CalledProcessError):
+        clang_version = clang.encode()
+    key = hashlib.sha256(builtin_bytes + target.encode() + clang_version).hexdigest()
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "rcompiler" / "builtin" / f"{key}.s"
+
+
+def store_in_cache(source: Path, cache_path: Path) -> None:
+    """Best-effort atomic publish into the cache; never fails the run."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name per writer: with a fixed one, two concurrent
+        # publishers of the same key would share an inode and a reader could
+        # see a half-written entry after the first rename.
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source, tmp_name)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        pass
 
 
 def compile_builtin(clang: str, target: str, builtin_path: Path, work_root: Path) -> Path:
-    builtin_source = work_root / "builtin.s.source"
     builtin_clean = work_root / "builtin.s"
 
+    # builtin.c almost never changes; reuse the cached assembly when the
+    # source/target/clang combination has been compiled before.
+    cache_path = builtin_cache_path(clang, target, builtin_path.read_bytes())
+    if cache_path.is_file():
+        shutil.copyfile(cache_path, builtin_clean)
+        return builtin_clean
+
+    # Ask clang for the assembly on stdout and strip @plt in memory rather
+    # than round-tripping a .s.source file through disk.
     result = run_cmd(
-        [clang, "-S", f"--target={target}", "-O2", "-fno-builtin", str(builtin_path), "-o", str(builtin_source)],
+        [clang, "-S", f"--target={target}", "-O2", "-fno-builtin", str(builtin_path), "-o", "-"],
     )
     if result.returncode != 0:
         sys.stderr.write("error: failed to compile builtin.c\n")
-        sys.stderr.write(result.stderr)
+        sys.stderr.write(result.stderr.decode("utf-8", errors="replace"))
         sys.exit(1)
 
-    remove_plt(builtin_source, builtin_clean)
+    # The assembly is ASCII by construction; strip @plt at the bytes level so
+    # nothing is decoded just to be re-encoded.
+    builtin_clean.write_bytes(result.stdout.replace(b"@plt", b""))
+    store_in_cache(builtin_clean, cache_path)
     return builtin_clean
 
 
-def extract_last_line(text: str) -> str:
-    stripped = text.rstrip().splitlines()
-    return stripped[-1] if stripped else "<no output>"
+def log_stage(logf: io.BufferedWriter, header: bytes, out: bytes = b"", err: bytes = b"") -> None:
+    """Append one stage's header and streams to an open per-case log."""
+    logf.write(header + b"\n")
+    if out:
+        logf.write(out.rstrip() + b"\n")
+    if err:
+        logf.write(err.rstrip() + b"\n")
+
+
+def extract_last_line(data: bytes) -> str:
+    stripped = data.rstrip()
+    if not stripped:
+        return "<no output>"
+    return stripped.rsplit(b"\n", 1)[-1].decode("utf-8", errors="replace")
+
+
+def run_one_case(
+    binary_path: Path,
+    src_dir: Path,
+    output_root: Path,
+    compiled_builtin: Path,
+    clang: str,
+    reimu: str,
+    target: str,
+    case_path: Path,
+) -> tuple[Path, str, str | None]:
+    """Run one fixture end to end; returns (rel_case, status label, failure reason or None).
+
+    The caller has already verified that the .in/.out companions exist.
+    """
+    rel_case = case_path.relative_to(src_dir)
+    case_dir = case_path.parent
+    case_name = case_path.stem
+    case_in = case_dir / f"{case_name}.in"
+    case_out = case_dir / f"{case_name}.out"
+
+    # Every case gets its own directory so concurrent workers never share the
+    # fixed test.* file names. Parents exist already (pre-created in main).
+    work_dir = output_root / rel_case.with_suffix("")
+    work_dir.mkdir(exist_ok=True)
+
+    # None of these are mutated, so a hardlink (an inode bump) beats copying
+    # the bytes once per case.
+    fast_clone(compiled_builtin, work_dir / "builtin.s")
+    fast_clone(case_in, work_dir / "test.in")
+    fast_clone(case_out, work_dir / "test.ans")
+
+    ir_path = work_dir / "test.ll"
+    asm_clean = work_dir / "test.s"
+    actual_output = work_dir / "test.out"
+
+    # Stream each stage's output into the log as it lands instead of
+    # accumulating a second copy of everything in a list.
+    with (output_root / rel_case.with_suffix(".log")).open("wb") as logf:
+        result_ir = run_cmd([str(binary_path), str(case_path), str(ir_path)])
+        log_stage(logf, b"== ir_pipeline ==", result_ir.stdout, result_ir.stderr)
+
+        if result_ir.returncode != 0:
+            reason = f"ir_pipeline exit {result_ir.returncode}: {extract_last_line(result_ir.stderr or result_ir.stdout)}"
+            return (rel_case, "fail (compile)", reason)
+
+        # Assembly arrives on stdout; only stderr carries diagnostics now.
+        result_clang = run_cmd([clang, "-S", "-O2", f"--target={target}", str(ir_path), "-o", "-"])
+        log_stage(logf, b"== clang ==", err=result_clang.stderr)
+
+        if result_clang.returncode != 0:
+            reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr)}"
+            return (rel_case, "fail (clang)", reason)
+
+        asm_clean.write_bytes(result_clang.stdout.replace(b"@plt", b""))
+
+        result_run = run_cmd([
+            reimu,
+            f"-i={work_dir / 'test.in'}",
+            f"-o={actual_output}",
+        ], cwd=work_dir)
+        log_stage(logf, b"== reimu ==", result_run.stdout, result_run.stderr)
+
+        if result_run.returncode != 0:
+            reason = f"reimu exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
+            return (rel_case, "fail (runtime)", reason)
+
+    matched = outputs_equal(actual_output, work_dir / "test.ans")
+
+    shutil.copyfile(actual_output, output_root / rel_case.with_suffix(".out"))
+
+    if matched:
+        return (rel_case, "pass", None)
+    return (rel_case, "fail (output)", "output mismatch")
 
 
 def main() -> int:
@@ -169,97 +324,51 @@ def main() -> int:
 
     failures: list[tuple[Path, str]] = []
     total = len(cases)
+    done = 0
 
-    for idx, case_path in enumerate(cases, start=1):
-        rel_case = case_path.relative_to(src_dir)
+    # Check for .in/.out companions once up front so workers never stat for
+    # them; cases missing one are recorded as failures without entering the pool.
+    runnable: list[Path] = []
+    for case_path in cases:
         case_dir = case_path.parent
-        case_name = case_path.stem
-        case_in = case_dir / f"{case_name}.in"
-        case_out = case_dir / f"{case_name}.out"
-
-        if not case_in.is_file() or not case_out.is_file():
-            failures.append((rel_case, "missing .in or .out file"))
-            print(f"[{idx}/{total}] {rel_case}: {RED}missing input/output{RESET}")
-            continue
-
-        work_dir = output_root / rel_case.parent
-        work_dir.mkdir(parents=True, exist_ok=True)
-
-        shutil.copy(compiled_builtin, work_dir / "builtin.s")
-        shutil.copy(case_in, work_dir / "test.in")
-        shutil.copy(case_out, work_dir / "test.ans")
-
-        ir_path = work_dir / "test.ll"
-        asm_source = work_dir / "test.s.source"
-        asm_clean = work_dir / "test.s"
-        actual_output = work_dir / "test.out"
-
-        log_lines: list[str] = []
-
-        result_ir = run_cmd([str(binary_path), str(case_path), str(ir_path)])
-        log_lines.append("== ir_pipeline ==")
-        if result_ir.stdout:
-            log_lines.append(result_ir.stdout.rstrip())
-        if result_ir.stderr:
-            log_lines.append(result_ir.stderr.rstrip())
-
-        if result_ir.returncode != 0:
-            reason = f"ir_pipeline exit {result_ir.returncode}: {extract_last_line(result_ir.stderr or result_ir.stdout)}"
-            failures.append((rel_case, reason))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (compile){RESET}")
-            (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-            (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-            continue
-
-        result_clang = run_cmd([clang, "-S", "-O2", f"--target={args.target}", str(ir_path), "-o", str(asm_source)])
-        log_lines.append("== clang ==")
-        if result_clang.stdout:
-            log_lines.append(result_clang.stdout.rstrip())
-        if result_clang.stderr:
-            log_lines.append(result_clang.stderr.rstrip())
-
-        if result_clang.returncode != 0:
-            reason = f"clang exit {result_clang.returncode}: {extract_last_line(result_clang.stderr or result_clang.stdout)}"
-            failures.append((rel_case, reason))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (clang){RESET}")
-            (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-            (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-            continue
-
-        remove_plt(asm_source, asm_clean)
-
-        result_run = run_cmd([
-            reimu,
-            f"-i={work_dir / 'test.in'}",
-            f"-o={actual_output}",
-        ], cwd=work_dir)
-        log_lines.append("== reimu ==")
-        if result_run.stdout:
-            log_lines.append(result_run.stdout.rstrip())
-        if result_run.stderr:
-            log_lines.append(result_run.stderr.rstrip())
-
-        if result_run.returncode != 0:
-            reason = f"reimu exit {result_run.returncode}: {extract_last_line(result_run.stderr or result_run.stdout)}"
-            failures.append((rel_case, reason))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (runtime){RESET}")
-            (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-            (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-            continue
-
-        actual_lines = normalize_output(actual_output)
-        expected_lines = normalize_output(work_dir / "test.ans")
-        matched = actual_lines == expected_lines
-
-        (output_root / rel_case.parent).mkdir(parents=True, exist_ok=True)
-        (output_root / rel_case.with_suffix(".out")).write_text(actual_output.read_text(encoding="utf-8"), encoding="utf-8")
-        (output_root / rel_case.with_suffix(".log")).write_text("\n".join(log_lines).rstrip() + "\n", encoding="utf-8")
-
-        if matched:
-            print(f"[{idx}/{total}] {rel_case}: {GREEN}pass{RESET}")
+        if (case_dir / f"{case_path.stem}.in").is_file() and (case_dir / f"{case_path.stem}.out").is_file():
+            runnable.append(case_path)
         else:
-            failures.append((rel_case, f"output mismatch"))
-            print(f"[{idx}/{total}] {rel_case}: {RED}fail (output){RESET}")
+            rel_case = case_path.relative_to(src_dir)
+            failures.append((rel_case, "missing .in or .out file"))
+            done += 1
+            print(f"[{done}/{total}] {rel_case}: {RED}missing input/output{RESET}")
+
+    # Create every output parent directory in one pass; each in-worker
+    # mkdir(parents=True) would stat the whole chain again per case.
+    needed_dirs = {output_root / p.relative_to(src_dir).parent for p in runnable}
+    for directory in sorted(needed_dirs):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    run_case = partial(
+        run_one_case,
+        binary_path,
+        src_dir,
+        output_root,
+        compiled_builtin,
+        clang,
+        reimu,
+        args.target,
+    )
+    jobs = max(1, args.jobs or 1)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_case, case_path) for case_path in runnable]
+        for future in as_completed(futures):
+            rel_case, status, reason = future.result()
+            done += 1
+            if reason is None:
+                print(f"[{done}/{total}] {rel_case}: {GREEN}{status}{RESET}")
+            else:
+                failures.append((rel_case, reason))
+                print(f"[{done}/{total}] {rel_case}: {RED}{status}{RESET}")
+
+    # as_completed yields in finish order; keep the summary deterministic.
+    failures.sort(key=lambda item: str(item[0]))
 
     summary_path = output_root / "summary"
     summary_lines = [f"Total: {total}, Passed: {total - len(failures)}, Failed: {len(failures)}"]